@@ -3,7 +3,7 @@ This module is used to configure the system and display current system informati
 and settings.
 '''
 from __future__ import absolute_import, print_function
-from ctypes import cdll, c_char_p, c_int, POINTER
+from ctypes import cdll, c_char_p, c_int, c_size_t, c_void_p, POINTER, CFUNCTYPE, string_at
 import os
 from os.path import dirname
 import sys
@@ -11,6 +11,7 @@ import platform
 from pystata.stexception import IPythonError, IPyKernelError
 import codecs
 import atexit
+import threading
 
 def _find_lib(st_home, edition, os_system):
     lib_name = ""	
@@ -93,7 +94,14 @@ stinitialized = False
 sfiinitialized = False
 stlibpath = None
 stipython = 0
+stgrdisplay = None
 stoutputf = None
+stoutevent = threading.Event()
+stoutnotifier = None
+stoutsink = None
+stoutsinkf = None
+stoutsinkbuf = None
+stoutsinkdec = None
 
 stconfig = {
     "grwidth": ['default', 'in'],
@@ -200,6 +208,78 @@ def _init_stata():
     return(rc)
 
 
+def _notify_output():
+    stoutevent.set()
+
+
+def _set_output_notifier():
+    global stoutnotifier
+
+    try:
+        set_notifier = stlib.StataSO_SetOutputNotifier
+    except AttributeError:
+        return
+
+    set_notifier.restype = None
+    stoutnotifier = CFUNCTYPE(None)(_notify_output)
+    set_notifier(stoutnotifier)
+
+
+def _output_sink(ptr, size):
+    output = stoutsinkdec.decode(string_at(ptr, size))
+    if len(output)!=0:
+        _write_sink_output(output)
+
+
+def _write_sink_output(output):
+    if stoutsinkbuf is not None:
+        stoutsinkbuf.append(output)
+
+    if stoutsinkf is not None:
+        if pyversion[0] < 3:
+            output = output.encode('utf-8')
+
+        stoutsinkf.write(output)
+        stoutsinkf.flush()
+
+
+def _init_output_sink():
+    global stoutsink
+
+    try:
+        set_sink = stlib.StataSO_SetOutputSink
+    except AttributeError:
+        return
+
+    set_sink.restype = None
+    stoutsink = CFUNCTYPE(None, c_void_p, c_size_t)(_output_sink)
+
+
+def _set_output_sink(f, buf=None):
+    global stoutsinkf, stoutsinkbuf, stoutsinkdec
+
+    if f is None and buf is None:
+        stlib.StataSO_SetOutputSink(None)
+        output = stoutsinkdec.decode(b'', True)
+        if len(output)!=0:
+            _write_sink_output(output)
+
+        stoutsinkdec = None
+        stoutsinkf = None
+        stoutsinkbuf = None
+    else:
+        if pyversion[0] >= 3:
+            errors = 'backslashreplace'
+        else:
+            codecs.register_error('backslashreplace_py2', backslashreplace_py2)
+            errors = 'backslashreplace_py2'
+
+        stoutsinkdec = codecs.getincrementaldecoder('utf-8')(errors)
+        stoutsinkf = f
+        stoutsinkbuf = buf
+        stlib.StataSO_SetOutputSink(stoutsink)
+
+
 def init(edition):
     """
     Initialize Stata's environment within Python.
@@ -215,6 +295,7 @@ def init(edition):
     global stlib
     global stedition
     global stipython
+    global stgrdisplay
     if stinitialized is False:
         st_home = _get_st_home()
         os.environ['SYSDIR_STATA'] = st_home
@@ -242,6 +323,8 @@ def init(edition):
             _print_greeting_message(msg)
 	
         stinitialized = True
+        _set_output_notifier()
+        _init_output_sink()
         _load_system_config()
 
         stipython = 0
@@ -256,6 +339,13 @@ def init(edition):
         except:
             stipython = 5
 
+        if stipython >= 3:
+            try:
+                from pystata.ipython.grdisplay import display_stata_graph
+                stgrdisplay = display_stata_graph
+            except:
+                stgrdisplay = None
+
         if sys.version_info[0] < 3:
             reload(sys)
             sys.setdefaultencoding('utf-8')
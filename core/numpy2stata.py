@@ -109,4 +109,4 @@ def array_from_stata(stfr, var, obs, selectvar, valuelabel, missingval):
 
 
 def array_from_matrix(stmat):
-    return np.array(stmat)
+    return np.array(stmat, dtype=np.float64)
@@ -3,7 +3,6 @@ from __future__ import unicode_literals
 from pystata import config
 import sys
 import threading 
-import time
 
 def output_get_interactive_result(output, real_cmd, colon, mode):
     try:
@@ -120,39 +119,63 @@ def _print_streaming_output(output, newline):
         sys.stdout.flush()
 
 
+def _adaptive_wait(event, backoff):
+    if backoff is None:
+        event.wait()
+    else:
+        event.wait(backoff['cur'])
+        backoff['cur'] = min(backoff['cur']*2, backoff['max'])
+
+
 class RepeatTimer(threading.Thread):
-    def __init__(self, tname, otype, queue, interval, real_cmd, colon, mode):       
+    def __init__(self, tname, otype, interval, real_cmd, colon, mode):       
         threading.Thread.__init__(self, name=tname)
-        self.q = queue
+        self.daemon = True
+        self.rc = None
         self.otype = otype
         self.interval = interval
-        self.is_done = False
+        self.finished = threading.Event()
         self.old_stdout = sys.stdout
         self.old_stderr = sys.stderr
         self.real_cmd = real_cmd
         self.colon = colon
         self.mode = mode
+        self.notify = config.stoutevent
+        self.notify.clear()
 
     def done(self):
         sys.stdout = self.old_stdout
         sys.stderr = self.old_stderr
-        self.is_done = True
+        self.finished.set()
+        self.notify.set()
+
+    def set_rc(self, rc):
+        self.rc = rc
+        self.notify.set()
 
     def run(self):       
-        while not self.is_done:
+        if config.stoutnotifier is None:
+            backoff = {'cur': 0.001, 'min': 0.001, 'max': self.interval}
+        else:
+            backoff = None
+
+        while not self.finished.is_set():
             self.sys_stdout = sys.stdout
             self.sys_stderr = sys.stderr
             sys.stdout = self.old_stdout
             sys.stderr = self.old_stderr
+            rc = self.rc
             output = config.get_output()
-            if self.q.empty():
+            if rc is None:
                 if len(output)!=0:
+                    if backoff is not None:
+                        backoff['cur'] = backoff['min']
+
                     if self.mode!=1 and self.otype==2:
                         output = output_get_interactive_result(output, self.real_cmd, self.colon, self.mode)
                     
                     _print_streaming_output(output, False)
             else:
-                rc = self.q.get()
                 self.done()
                 if rc == 0:
                     if self.otype==1:
@@ -177,4 +200,5 @@ class RepeatTimer(threading.Thread):
 
             sys.stdout = self.sys_stdout
             sys.stderr = self.sys_stderr
-            time.sleep(self.interval)
+            _adaptive_wait(self.notify, backoff)
+            self.notify.clear()
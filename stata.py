@@ -7,19 +7,17 @@ from ctypes import c_char_p, c_void_p, cast
 from pystata import config
 config.check_initialized()
 
-if config.pyversion[0]<3:
-    from Queue import LifoQueue
-    from codecs import open
-else:
-    from queue import LifoQueue
-
 import sfi
 from pystata.core import stout
 import codeop
+import os
 import sys
 
 rc2 = 0
-gr_display_func = None
+_stata_display = stout.StataDisplay()
+_stata_error = stout.StataError()
+_gr_list_on = config.get_encode_str("qui _gr_list on")
+_gr_list_off = config.get_encode_str("qui _gr_list off")
 has_num_pand = {
     "pknum":  True,
     "pkpand": True
@@ -35,50 +33,113 @@ try:
 except:
     has_num_pand['pkpand'] = False
 
+_has_pknum = has_num_pand['pknum']
+_has_pkpand = has_num_pand['pkpand']
+
 
 def _print_no_streaming_output(output, newline):
-    if config.pyversion[0] >= 3:
-        if newline:
-            print(output, file=config.stoutputf)
-        else:
-            print(output, end='', file=config.stoutputf)
-    else:
-        if newline:
-            print(config.get_encode_str(output), file=config.stoutputf)
-        else:
-            print(config.get_encode_str(output), end='', file=config.stoutputf)
+    f = config.stoutputf
+    if f is None:
+        f = sys.stdout
 
+    if config.pyversion[0] < 3:
+        output = config.get_encode_str(output)
 
-def _stata_wrk1(cmd, echo=False):
-    if config.stconfig['streamout']=='on':
+    f.write(output)
+    if newline:
+        f.write('\n')
+
+
+_do_file_flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+
+def _write_fd(fd, data):
+    data = memoryview(data)
+    while len(data) > 0:
+        data = data[os.write(fd, data):]
+
+
+def _write_do_file(tmpf, content):
+    fd = os.open(tmpf, _do_file_flags, 0o666)
+    try:
+        _write_fd(fd, content.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+def _stata_wrk1(cmd, echo=False, quietly=False):
+    execute = config.stlib.StataSO_Execute
+    encode = config.get_encode_str
+    if config.stoutsink is not None:
+        try:
+            if config.stconfig['streamout']=='on' and not quietly:
+                f = config.stoutputf
+                if f is None:
+                    f = sys.stdout
+            else:
+                f = None
+
+            chunks = []
+            if f is None:
+                config._set_output_sink(None, chunks)
+            else:
+                config._set_output_sink(f)
+
+            try:
+                with stout.RedirectOutput(_stata_display, _stata_error):
+                    rc1 = execute(encode(cmd), echo)
+            finally:
+                config._set_output_sink(None)
+
+            get_output = config.get_output
+            output = get_output()
+            while len(output)!=0:
+                chunks.append(output)
+                output = get_output()
+
+            output = ''.join(chunks)
+            if rc1 != 0:
+                if len(output)!=0:
+                    raise SystemError(output)
+                else:
+                    raise SystemError("failed to execute the specified command")
+
+            if len(output)!=0:
+                _print_no_streaming_output(output, False)
+        except KeyboardInterrupt:
+            config.stlib.StataSO_SetBreak()
+            print('\nKeyboardInterrupt: --break--')
+    elif config.stconfig['streamout']=='on' and not quietly:
         try:
-            queue = LifoQueue()
-            outputter = stout.RepeatTimer('Stata', 1, queue, 0.015, None, None, None)
+            outputter = stout.RepeatTimer('Stata', 1, 0.05, None, None, None)
             outputter.start()
 
-            with stout.RedirectOutput(stout.StataDisplay(), stout.StataError()):
-                rc1 = config.stlib.StataSO_Execute(config.get_encode_str(cmd), echo)
+            with stout.RedirectOutput(_stata_display, _stata_error):
+                rc1 = execute(encode(cmd), echo)
 
-            queue.put(rc1)
+            outputter.set_rc(rc1)
 
             outputter.join()
             outputter.done()
         except KeyboardInterrupt:
-            outputter.done()
             config.stlib.StataSO_SetBreak()
+            outputter.done()
+            outputter.join(outputter.interval)
             print('\nKeyboardInterrupt: --break--')
     else:
         try:
-            with stout.RedirectOutput(stout.StataDisplay(), stout.StataError()):
-                rc1 = config.stlib.StataSO_Execute(config.get_encode_str(cmd), echo)
+            with stout.RedirectOutput(_stata_display, _stata_error):
+                rc1 = execute(encode(cmd), echo)
 
-            output = config.get_output()
+            get_output = config.get_output
+            printf = _print_no_streaming_output
+            output = get_output()
             while len(output)!=0:
                 if rc1 != 0:
                     raise SystemError(output)
 
-                _print_no_streaming_output(output, False)
-                output = config.get_output()
+                printf(output, False)
+                output = get_output()
             else:
                 if rc1 != 0:
                     raise SystemError("failed to execute the specified command")
@@ -89,52 +150,57 @@ def _stata_wrk1(cmd, echo=False):
 
 def _stata_wrk2(cmd, real_cmd, colon, mode):
     global rc2
+    execute = config.stlib.StataSO_Execute
+    encode = config.get_encode_str
     if config.stconfig['streamout']=='on':
         try:
-            queue = LifoQueue()
-            outputter = stout.RepeatTimer('Stata', 2, queue, 0.015, real_cmd, colon, mode)
+            outputter = stout.RepeatTimer('Stata', 2, 0.05, real_cmd, colon, mode)
             outputter.start()
 
-            with stout.RedirectOutput(stout.StataDisplay(), stout.StataError()):
-                rc2 = config.stlib.StataSO_Execute(config.get_encode_str(cmd), False)
+            with stout.RedirectOutput(_stata_display, _stata_error):
+                rc2 = execute(encode(cmd), False)
                 
-            queue.put(rc2)
+            outputter.set_rc(rc2)
 
             outputter.join()
             outputter.done()
         except KeyboardInterrupt:
-            outputter.done()
             config.stlib.StataSO_SetBreak()
+            outputter.done()
+            outputter.join(outputter.interval)
             print('\nKeyboardInterrupt: --break--')
     else:
         try:
-            with stout.RedirectOutput(stout.StataDisplay(), stout.StataError()):
-                rc2 = config.stlib.StataSO_Execute(config.get_encode_str(cmd), False)
+            with stout.RedirectOutput(_stata_display, _stata_error):
+                rc2 = execute(encode(cmd), False)
 
-            output = config.get_output()
+            get_output = config.get_output
+            get_interactive = stout.output_get_interactive_result
+            printf = _print_no_streaming_output
+            output = get_output()
             if rc2 != 0:
                 if rc2 != 3000:
                     if mode!=1:
-                        output = stout.output_get_interactive_result(output, real_cmd, colon, mode)
-                        _print_no_streaming_output(output, False)
+                        output = get_interactive(output, real_cmd, colon, mode)
+                        printf(output, False)
                     else:
-                        raise SystemError(config.get_encode_str(output))
+                        raise SystemError(encode(output))
 
             else:
                 while len(output)!=0:
-                    output_tmp = config.get_output()
+                    output_tmp = get_output()
                     if len(output_tmp)==0:
                         if mode!=1:
-                            output = stout.output_get_interactive_result(output, real_cmd, colon, mode)
-                            _print_no_streaming_output(output, False)
+                            output = get_interactive(output, real_cmd, colon, mode)
+                            printf(output, False)
                         else:
-                            _print_no_streaming_output(output, True)
+                            printf(output, True)
                         break
                     else:
                         if mode!=1:
-                            output = stout.output_get_interactive_result(output, real_cmd, colon, mode)
+                            output = get_interactive(output, real_cmd, colon, mode)
                             
-                        _print_no_streaming_output(output, False)
+                        printf(output, False)
                         output = output_tmp
         except KeyboardInterrupt:
             config.stlib.StataSO_SetBreak()
@@ -185,7 +251,6 @@ def run(cmd, quietly=False, echo=False, inline=None):
         in an error.
     """
     global rc2
-    config.check_initialized()
 
     if inline is None:
         inline = config.stconfig['grshow']
@@ -193,15 +258,29 @@ def run(cmd, quietly=False, echo=False, inline=None):
         if inline is not True and inline is not False:
             raise TypeError('inline must be a boolean value')
 
+    if not cmd.strip():
+        return
+
+    # graphs are only displayed within IPython, so skip the _gr_list
+    # round-trips everywhere else
+    if inline and config.stgrdisplay is None:
+        inline = False
+
     config.stlib.StataSO_ClearOutputBuffer()
-    cmds = cmd.splitlines()
-    if len(cmds) == 0:
-        return 
-    elif len(cmds) == 1:
+    if '\n' not in cmd and '\r' not in cmd:
+        single_cmd = cmd
+    else:
+        cmds = cmd.splitlines()
+        if len(cmds) == 1:
+            single_cmd = cmds[0]
+        else:
+            single_cmd = None
+
+    if single_cmd is not None:
         if inline:
-            config.stlib.StataSO_Execute(config.get_encode_str("qui _gr_list on"), False)
+            config.stlib.StataSO_Execute(_gr_list_on, False)
 
-        input_cmd = cmds[0].strip()
+        input_cmd = single_cmd.strip()
         if input_cmd=="mata" or input_cmd=="mata:":
             has_colon = False
             if input_cmd=="mata:":
@@ -213,36 +292,42 @@ def run(cmd, quietly=False, echo=False, inline=None):
             incmds1 = ""
             incmds2 = "" 
             inprompt = ": "
-            while incmd!="end":
-                incmd = incmd + "\n"
-                incmds1 = incmds1 + incmd
-                incmd = inprompt + incmd
-                incmds2 = incmds2 + incmd
-
-                tmpf = sfi.SFIToolkit.getTempFile()
-                with open(tmpf, 'w', encoding="utf-8") as f:
-                    f.write(input_cmd+"\n")
-                    f.write(incmds1)
-                    f.write("end")
-
-                if quietly:
-                    _stata_wrk2("qui include " + tmpf, incmds2, has_colon, 2)
-                else:
-                    _stata_wrk2("include " + tmpf, incmds2, has_colon, 2)
+            tmpf = sfi.SFIToolkit.getTempFile()
+            fd = os.open(tmpf, _do_file_flags, 0o666)
+            try:
+                header = (input_cmd+"\n").encode('utf-8')
+                _write_fd(fd, header)
+                hdrpos = len(header)
+                while incmd!="end":
+                    incmd = incmd + "\n"
+                    incmds1 = incmds1 + incmd
+                    incmd = inprompt + incmd
+                    incmds2 = incmds2 + incmd
+
+                    os.lseek(fd, hdrpos, os.SEEK_SET)
+                    os.ftruncate(fd, hdrpos)
+                    _write_fd(fd, (incmds1 + "end").encode('utf-8'))
 
-                if rc2 != 0:
-                    if rc2 != 3000:
-                        break
+                    if quietly:
+                        _stata_wrk2("qui include " + tmpf, incmds2, has_colon, 2)
                     else:
-                        incmd = _get_user_input("> ").strip()
-                        inprompt = "> "
+                        _stata_wrk2("include " + tmpf, incmds2, has_colon, 2)
+
+                    if rc2 != 0:
+                        if rc2 != 3000:
+                            break
+                        else:
+                            incmd = _get_user_input("> ").strip()
+                            inprompt = "> "
+                    else:
+                        incmd = _get_user_input(": ").strip()
+                        incmds1 = ""
+                        incmds2 = ""
+                        inprompt = ": "
                 else:
-                    incmd = _get_user_input(": ").strip()
-                    incmds1 = ""
-                    incmds2 = ""
-                    inprompt = ": "
-            else:
-                sfi.SFIToolkit.displayln("{hline}")
+                    sfi.SFIToolkit.displayln("{hline}")
+            finally:
+                os.close(fd)
         elif input_cmd=="python" or input_cmd=="python:":
             has_colon = False
             if input_cmd=="python:":
@@ -254,58 +339,63 @@ def run(cmd, quietly=False, echo=False, inline=None):
             incmds1 = ""
             incmds2 = "" 
             inprompt = ">>> "
-            while incmd!="end":
-                incmds1 = incmds1 + incmd
-                incmd = inprompt + incmd
-                incmds2 = incmds2 + incmd
-
-                if incmd[:6]!="stata:":
-                    res = incmd
-                    try:
-                        res = codeop.compile_command(incmds1, '<input>', 'single')
-                        incmds1 = incmds1 + "\n"
-                        incmds2 = incmds2 + "\n"
-                    except (OverflowError, SyntaxError, ValueError):
-                        pass
-                else: 
-                    res = incmd
-                   
-                if res is None:
-                    incmd = _get_user_input("... ")
-                    inprompt = "... "
-                else:
-                    tmpf = sfi.SFIToolkit.getTempFile()
-                    with open(tmpf, 'w', encoding="utf-8") as f:
-                        f.write(input_cmd+"\n")
-                        f.write(incmds1)
-                        f.write("end")
-					
-                    if quietly:
-                        _stata_wrk2("qui include " + tmpf, incmds2, has_colon, 3)
+            tmpf = sfi.SFIToolkit.getTempFile()
+            fd = os.open(tmpf, _do_file_flags, 0o666)
+            try:
+                header = (input_cmd+"\n").encode('utf-8')
+                _write_fd(fd, header)
+                hdrpos = len(header)
+                while incmd!="end":
+                    incmds1 = incmds1 + incmd
+                    incmd = inprompt + incmd
+                    incmds2 = incmds2 + incmd
+
+                    if incmd[:6]!="stata:":
+                        res = incmd
+                        try:
+                            res = codeop.compile_command(incmds1, '<input>', 'single')
+                            incmds1 = incmds1 + "\n"
+                            incmds2 = incmds2 + "\n"
+                        except (OverflowError, SyntaxError, ValueError):
+                            pass
+                    else: 
+                        res = incmd
+
+                    if res is None:
+                        incmd = _get_user_input("... ")
+                        inprompt = "... "
                     else:
-                        _stata_wrk2("include " + tmpf, incmds2, has_colon, 3)
+                        os.lseek(fd, hdrpos, os.SEEK_SET)
+                        os.ftruncate(fd, hdrpos)
+                        _write_fd(fd, (incmds1 + "end").encode('utf-8'))
 
-                    if rc2 != 0:
-                        break
+                        if quietly:
+                            _stata_wrk2("qui include " + tmpf, incmds2, has_colon, 3)
+                        else:
+                            _stata_wrk2("include " + tmpf, incmds2, has_colon, 3)
 
-                    incmd = _get_user_input(">>> ")
-                    incmds1 = ""
-                    incmds2 = ""
-                    inprompt = ">>> "						
-            else:
-                sfi.SFIToolkit.displayln("{hline}")
+                        if rc2 != 0:
+                            break
+
+                        incmd = _get_user_input(">>> ")
+                        incmds1 = ""
+                        incmds2 = ""
+                        inprompt = ">>> "						
+                else:
+                    sfi.SFIToolkit.displayln("{hline}")
+            finally:
+                os.close(fd)
         else:
             if quietly:
-                _stata_wrk1("qui " + cmds[0], echo)
+                _stata_wrk1("qui " + single_cmd, echo, True)
             else:
-                _stata_wrk1(cmds[0], echo)
+                _stata_wrk1(single_cmd, echo)
     else:
         if inline:
-            config.stlib.StataSO_Execute(config.get_encode_str("qui _gr_list on"), False)
+            config.stlib.StataSO_Execute(_gr_list_on, False)
 
         tmpf = sfi.SFIToolkit.getTempFile()
-        with open(tmpf, 'w', encoding="utf-8") as f:
-            f.write(cmd)
+        _write_do_file(tmpf, cmd)
 
         if quietly:
             _stata_wrk2("qui include " + tmpf, None, False, 1)
@@ -313,15 +403,9 @@ def run(cmd, quietly=False, echo=False, inline=None):
             _stata_wrk2("include " + tmpf, None, False, 1)
 
     if inline:
-        if config.get_stipython()>=3:
-            global gr_display_func
-            if gr_display_func is None:
-                from pystata.ipython.grdisplay import display_stata_graph
-                gr_display_func = display_stata_graph
-
-            gr_display_func()
+        config.stgrdisplay()
 
-        config.stlib.StataSO_Execute(config.get_encode_str("qui _gr_list off"), False)
+        config.stlib.StataSO_Execute(_gr_list_off, False)
 
 
 def nparray_to_data(arr, prefix='v', force=False):
@@ -358,17 +442,14 @@ def nparray_to_data(arr, prefix='v', force=False):
         This error can be raised if there is a dataset in memory that has 
         changed since it was last saved, and `force` is False.
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pknum']:
+    if not _has_pknum:
         raise SystemError('NumPy package is required to use this function.')
 
-    changed = sfi.Scalar.getValue('c(changed)')
-    if int(changed)==1 and force is False:
+    changed = int(sfi.Scalar.getValue('c(changed)'))
+    if changed==1 and force is False:
         raise SystemError('no; dataset in memory has changed since last saved')
 
-    if int(changed)==0 or force is True:
+    if changed==0 or force is True:
         run('clear')
 
     numpy2stata.array_to_stata(arr, None, prefix)
@@ -410,17 +491,14 @@ def pdataframe_to_data(df, force=False):
         This error can be raised if there is a dataset in memory that has been 
         changed since it was last saved, and `force` is False.
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pkpand']:
+    if not _has_pkpand:
         raise SystemError('pandas package is required to use this function.')
 
-    changed = sfi.Scalar.getValue('c(changed)')
-    if int(changed)==1 and force is False:
+    changed = int(sfi.Scalar.getValue('c(changed)'))
+    if changed==1 and force is False:
         raise SystemError('no; dataset in memory has changed since last saved')
 
-    if int(changed)==0 or force is True:
+    if changed==0 or force is True:
         run('clear')
 
     pandas2stata.dataframe_to_stata(df, None)
@@ -494,10 +572,7 @@ def nparray_from_data(var=None, obs=None, selectvar=None, valuelabel=False, miss
     value for the parameter `missingval` of the above function. Users are 
     not recommended to use this class for any other purpose.
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pknum']:
+    if not _has_pknum:
         raise SystemError('NumPy package is required to use this function.')
 
     if isinstance(missingval, _DefaultMissing):
@@ -554,10 +629,7 @@ def pdataframe_from_data(var=None, obs=None, selectvar=None, valuelabel=False, m
         in `obs` are out of range. Last, it may be raised if `selectvar` is out of 
         range or not found.
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pkpand']:
+    if not _has_pkpand:
         raise SystemError('pandas package is required to use this function.')
 
     if isinstance(missingval, _DefaultMissing):
@@ -603,10 +675,7 @@ def nparray_to_frame(arr, stfr, prefix='v', force=False):
         This error can be raised if the specified frame already exists in 
         Stata, and `force` is False.
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pknum']:
+    if not _has_pknum:
         raise SystemError('NumPy package is required to use this function.')
 
     stframe = None
@@ -663,10 +732,7 @@ def pdataframe_to_frame(df, stfr, force=False):
         This error can be raised if the specified frame already exists 
         in Stata, and `force` is False.
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pkpand']:
+    if not _has_pkpand:
         raise SystemError('pandas package is required to use this function.')
 
     stframe = None
@@ -740,10 +806,7 @@ def nparray_from_frame(stfr, var=None, obs=None, selectvar=None, valuelabel=Fals
         can be raised if the frame `stfr` does not already exist in Stata, or 
         if Python fails to connect to the frame.
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pknum']:
+    if not _has_pknum:
         raise SystemError('NumPy package is required to use this function.')
 
     if isinstance(missingval, _DefaultMissing):
@@ -808,10 +871,7 @@ def pdataframe_from_frame(stfr, var=None, obs=None, selectvar=None, valuelabel=F
         can be raised if the frame `stfr` does not already exist in Stata, 
         or if Python fails to connect to the frame.
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pkpand']:
+    if not _has_pkpand:
         raise SystemError('pandas package is required to use this function.')
 
     if isinstance(missingval, _DefaultMissing):
@@ -820,61 +880,35 @@ def pdataframe_from_frame(stfr, var=None, obs=None, selectvar=None, valuelabel=F
         return(pandas2stata.dataframe_from_stata(stfr, var, obs, selectvar, valuelabel, missingval))
 
 
-def _get_return_val(res, cat):
-    if cat=="r()":
-        rrscalar = sfi.SFIToolkit.listReturn("r()", "scalar")
-        rscalar = rrscalar.split()
-        for rs in rscalar:
-            rs = "r(" + rs + ")"
-            val = sfi.Scalar.getValue(rs)
-            res[rs] = val
-
-        rrmac = sfi.SFIToolkit.listReturn("r()", "macro")
-        rmac = rrmac.split()
-        for rs in rmac:
-            rs = "r(" + rs + ")"
-            val = sfi.Macro.getGlobal(rs)
-            res[rs] = val
-
-        rrmat = sfi.SFIToolkit.listReturn("r()", "matrix")
-        rmat = rrmat.split()
-        for rm in rmat:
-            rm = "r(" + rm + ")"
-            val = numpy2stata.array_from_matrix(sfi.Matrix.get(rm))
-            res[rm] = val
-
-    elif cat=="e()":
-        eenum = sfi.SFIToolkit.listReturn("e()", "scalar")
-        enum = eenum.split()
-        for en in enum:
-            en = "e(" + en + ")"
-            val = sfi.Scalar.getValue(en)
-            res[en] = val
-
-        eestr = sfi.SFIToolkit.listReturn("e()", "macro")
-        estr = eestr.split()
-        for es in estr:
-            es = "e(" + es + ")"
-            val = sfi.Macro.getGlobal(es)
-            res[es] = val
-
-        eemat = sfi.SFIToolkit.listReturn("e()", "matrix")
-        emat = eemat.split()
-        for em in emat:
-            em = "e(" + em + ")"
-            val = numpy2stata.array_from_matrix(sfi.Matrix.get(em))
-            res[em] = val
+def _get_matrix_val(name):
+    return numpy2stata.array_from_matrix(sfi.Matrix.get(name))
+
+
+_return_val_spec = {
+    "r()": (("scalar", sfi.Scalar.getValue), ("macro", sfi.Macro.getGlobal), ("matrix", _get_matrix_val)),
+    "e()": (("scalar", sfi.Scalar.getValue), ("macro", sfi.Macro.getGlobal), ("matrix", _get_matrix_val)),
+    "s()": (("macro", sfi.Macro.getGlobal),)
+}
 
-    else:
-        ssmac = sfi.SFIToolkit.listReturn("s()", "macro")
-        smac = ssmac.split()
-        for ss in smac:
-            ss = "s(" + ss + ")"
-            val = sfi.Macro.getGlobal(ss)
-            res[ss] = val
 
+def _get_return_val(res, cat):
+    list_return = sfi.SFIToolkit.listReturn
+    prefix = cat[0] + "("
+    items = []
+    for rtype, get_val in _return_val_spec[cat]:
+        names = [prefix + rn + ")" for rn in list_return(cat, rtype).split()]
+        items.extend(zip(names, map(get_val, names)))
+
+    res.update(items)
     return res
 
+
+def _get_return_dict(cat):
+    if not _has_pknum:
+        raise SystemError('NumPy package is required to use this function.')
+
+    return _get_return_val({}, cat)
+
 	
 def get_return():
     """
@@ -888,15 +922,7 @@ def get_return():
     Dictionary
         A dictionary containing current **r()** results. 
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pknum']:
-        raise SystemError('NumPy package is required to use this function.')
-
-    res = {}
-    _get_return_val(res, "r()")
-    return res
+    return _get_return_dict("r()")
 
 
 def get_ereturn():
@@ -911,15 +937,7 @@ def get_ereturn():
     Dictionary
         A dictionary containing current **e()** results. 
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pknum']:
-        raise SystemError('NumPy package is required to use this function.')
-
-    res = {}
-    _get_return_val(res, "e()")
-    return res
+    return _get_return_dict("e()")
 
 
 def get_sreturn():
@@ -934,12 +952,4 @@ def get_sreturn():
     Dictionary
         A dictionary containing current **s()** results. 
     """
-    global has_num_pand
-    config.check_initialized()
-
-    if not has_num_pand['pknum']:
-        raise SystemError('NumPy package is required to use this function.')
-	
-    res = {}
-    _get_return_val(res, "s()")
-    return res
+    return _get_return_dict("s()")